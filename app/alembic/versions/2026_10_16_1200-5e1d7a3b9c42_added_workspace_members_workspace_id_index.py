@@ -0,0 +1,41 @@
+"""Added workspace_members.workspace_id index
+
+Revision ID: 5e1d7a3b9c42
+Revises: 9c63893fff56
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "5e1d7a3b9c42"
+down_revision: Union[str, None] = "9c63893fff56"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в таблицу, но не может выполняться
+    # внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_workspace_members_workspace_id"),
+            "workspace_members",
+            ["workspace_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            op.f("ix_workspace_members_workspace_id"),
+            table_name="workspace_members",
+            postgresql_concurrently=True,
+        )
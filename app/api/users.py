@@ -129,8 +129,10 @@ async def am_i_alive(
     \nВ случае успеха возвращается пустой ответ с заголовком `Token-Alive: true`. В случае неудачи возвращает `403`.
     """
 
+    # Токен проверяется запросом к еКурсам в обход кэша проверок
     await check_access_token_persistence(
-        access_token=current_user.access_token
+        access_token=current_user.access_token,
+        use_cache=False,
     )
     return ORJSONResponse(
         status_code=status.HTTP_200_OK,
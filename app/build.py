@@ -11,12 +11,14 @@ from api import router as api_router
 from core.exceptions import register_exceptions_handlers
 from core.middlewares import register_middlewares
 from core.models import db_helper
+from moodle.http import moodle_client
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI) -> AsyncGenerator[Any, Any]:
     """
-    Функция, которая закрывает сессию подключения к БД при завершении работы.
+    Функция, которая закрывает сессию подключения к БД и HTTP-клиент еКурсов
+    при завершении работы.
     """
 
     # На __aenter__ ничего не происходит
@@ -24,6 +26,7 @@ async def lifespan(_app: FastAPI) -> AsyncGenerator[Any, Any]:
     yield
     # На __aexit__ dispose
     await db_helper.dispose()
+    await moodle_client.aclose()
 
 
 def build_fastapi_app() -> FastAPI:
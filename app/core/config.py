@@ -186,18 +186,50 @@ class MoodleAPI(BaseModel):
         "?wstoken=%s"
         "&wsfunction=core_course_get_contents"
         "&moodlewsrestformat=json"
+        # Только модули заданий и без описаний прикрепленных к ним файлов
+        "&options[0][name]=modname"
+        "&options[0][value]=assign"
+        "&options[1][name]=excludecontents"
+        "&options[1][value]=1"
         "&courseid=%s"
     )
 
 
+class MoodleClient(BaseModel):
+    """Класс, содержащий параметры HTTP-клиента для запросов к еКурсам."""
+
+    http2: bool = True
+    timeout: float = 30.0
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+
+
+class AuthCache(BaseModel):
+    """Класс, содержащий параметры кэширования проверок access_token."""
+
+    ttl: float = 60.0
+    # Время жизни кэшированных пользователей. Кэш у каждого воркера свой, и
+    # обновление пользователя очищает только кэш обработавшего его воркера,
+    # поэтому время жизни ограничивает устаревание данных в остальных
+    user_ttl: float = 10.0
+    # Время жизни записей о несуществующих access_token
+    negative_ttl: float = 10.0
+    maxsize: int = 10_000
+
+
 class Database(BaseModel):
     """Класс, содержащий параметры подключения к базе данных."""
 
     url: PostgresDsn  # подтягивается из .env
     echo: bool = False
     echo_pool: bool = False
-    max_overflow: int = 50
-    pool_size: int = 10
+    # Пул создается в каждом из воркеров gunicorn: 3 * (20 + 10) подключений
+    # укладываются в max_connections=100 PostgreSQL по умолчанию
+    max_overflow: int = 10
+    pool_size: int = 20
+    pool_timeout: float = 10.0
+    pool_pre_ping: bool = True
+    pool_recycle: int = 1800
 
     naming_convention: dict[str, str] = {
         "ix": "ix_%(column_0_label)s",
@@ -221,6 +253,8 @@ class Settings(BaseSettings):
     run: Run = Run()
     api: ApiBase = ApiBase()
     moodle: MoodleAPI = MoodleAPI()
+    moodle_client: MoodleClient = MoodleClient()
+    auth_cache: AuthCache = AuthCache()
     db: Database
 
 
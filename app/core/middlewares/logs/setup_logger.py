@@ -1,12 +1,37 @@
 """Модуль, реализующий создание логгера."""
 
+import atexit
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
 # Лог-файл в корне проекта
 log_file: Path = Path(__file__).parent.parent.parent.parent.parent / "app.log"
 log_file.parent.mkdir(parents=True, exist_ok=True)
 
+
+class DeferredFormattingQueueHandler(QueueHandler):
+    """
+    Класс обработчика, передающего записи лога в очередь без форматирования.
+
+    Стандартный QueueHandler форматирует сообщение в потоке, который пишет в
+    лог, то есть в event loop. Здесь и форматирование, и запись в файл
+    выполняются в потоке QueueListener. Поэтому аргументы сообщения не должны
+    изменяться после вызова логгера.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Метод подготовки записи к помещению в очередь.
+
+        :param record: запись лога
+        :return: та же запись без изменений
+        """
+
+        return record
+
+
 logger: logging.Logger = logging.getLogger("my_logger")
 logger.setLevel(logging.INFO)
 
@@ -20,4 +45,12 @@ file_handler: logging.FileHandler = logging.FileHandler(
 )
 file_handler.setFormatter(formatter)
 
-logger.addHandler(file_handler)
+# Запись в файл выполняется в отдельном потоке, чтобы не блокировать
+# event loop
+log_queue: queue.SimpleQueue = queue.SimpleQueue()
+queue_listener: QueueListener = QueueListener(log_queue, file_handler)
+queue_listener.start()
+# При завершении процесса оставшиеся в очереди записи дописываются в файл
+atexit.register(queue_listener.stop)
+
+logger.addHandler(DeferredFormattingQueueHandler(log_queue))
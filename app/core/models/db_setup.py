@@ -21,6 +21,9 @@ class DatabaseSetup:
         echo_pool: bool = False,  # Вывод информации о подключениях
         max_overflow: int = 10,  # Количество переполнения подключений
         pool_size: int = 50,  # Количество одновременных подключений
+        pool_timeout: float = 30.0,  # Время ожидания свободного подключения
+        pool_pre_ping: bool = False,  # Проверка подключения перед выдачей
+        pool_recycle: int = -1,  # Время жизни подключения
     ) -> None:
         """
         Метод инициализации класса.
@@ -33,6 +36,12 @@ class DatabaseSetup:
         :param max_overflow: количество подключений, которое может быть
             создано, если основной пул подключений исчерпан
         :param pool_size: количество одновременных подключений
+        :param pool_timeout: время ожидания свободного подключения в секундах,
+            после которого выбрасывается исключение
+        :param pool_pre_ping: флаг определяющий, будет ли подключение
+            проверяться перед выдачей из пула
+        :param pool_recycle: время в секундах, после которого подключение
+            пересоздается (-1 - не пересоздается)
         """
 
         self.engine: AsyncEngine = create_async_engine(
@@ -41,6 +50,9 @@ class DatabaseSetup:
             echo_pool=echo_pool,
             max_overflow=max_overflow,
             pool_size=pool_size,
+            pool_timeout=pool_timeout,
+            pool_pre_ping=pool_pre_ping,
+            pool_recycle=pool_recycle,
         )
 
         self.session_factory: async_sessionmaker[AsyncSession] = (
@@ -52,6 +64,19 @@ class DatabaseSetup:
             )
         )
 
+        # Сессии для коротких запросов только на чтение. Подключения берутся
+        # из того же пула, но без BEGIN/COMMIT вокруг запросов
+        self.autocommit_session_factory: async_sessionmaker[AsyncSession] = (
+            async_sessionmaker(
+                bind=self.engine.execution_options(
+                    isolation_level="AUTOCOMMIT"
+                ),
+                autoflush=False,
+                autocommit=False,
+                expire_on_commit=False,
+            )
+        )
+
     async def dispose(self) -> None:
         """Метод закрытия подключений к БД."""
 
@@ -72,4 +97,7 @@ db_helper = DatabaseSetup(
     echo_pool=settings.db.echo_pool,
     max_overflow=settings.db.max_overflow,
     pool_size=settings.db.pool_size,
+    pool_timeout=settings.db.pool_timeout,
+    pool_pre_ping=settings.db.pool_pre_ping,
+    pool_recycle=settings.db.pool_recycle,
 )
@@ -218,6 +218,8 @@ class Workspace(Base):
 
     __table_args__ = (
         # Уникальность названия рабочего пространства в рамках одной группы
+        # На нарушение этого ограничения опирается crud.workspaces вместо
+        # предварительного SELECT (uq_workspaces_group_id_name)
         UniqueConstraint(
             "group_id",
             "name",
@@ -240,9 +242,13 @@ class WorkspaceMember(Base):
     )
 
     # ID рабочего пространства
+    # Индекс нужен для выборок членов и их подсчета по рабочему пространству:
+    # ограничение уникальности (user_id, workspace_id) начинается с user_id и
+    # покрывает только выборки по пользователю
     workspace_id: Mapped[int] = mapped_column(
         ForeignKey("workspaces.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
 
     # Флаг определяющий является ли член пространства его администратором
@@ -289,6 +289,7 @@ async def get_subjects_by_workspace_id(
     workspace_id: int,
     check_membership: bool = False,
     user_id: int = None,
+    check_foreign_key: bool = True,
 ) -> list[Subject]:
     """
     Функция, возвращающая список предметов по workspace_id.
@@ -298,6 +299,8 @@ async def get_subjects_by_workspace_id(
     :param check_membership: флаг, определяющий будет ли произведена проверка
         на принадлежность пользователя к рабочему пространству
     :param user_id: id пользователя в БД
+    :param check_foreign_key: флаг, определяющий будет ли произведена
+        проверка существования рабочего пространства
     :return: список предметов в рабочем пространстве
 
     :raises UserIsNotWorkspaceMemberException: если текущий пользователь не
@@ -307,7 +310,8 @@ async def get_subjects_by_workspace_id(
     """
 
     # Проверка существования рабочего пространства
-    await check_foreign_key_workspace_id(session, workspace_id)
+    if check_foreign_key:
+        await check_foreign_key_workspace_id(session, workspace_id)
 
     # Данная функция использутся при получении предметов с еКурсов, где
     # проверка на членство заменена проверкой на администратора.
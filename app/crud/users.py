@@ -1,10 +1,19 @@
 """Модуль, содержащий функции, реализующие CRUD-операции сущности User."""
 
+import asyncio
 from typing import Optional
 
-from sqlalchemy import select, Select
+from sqlalchemy import (
+    inspect,
+    lambda_stmt,
+    select,
+    Select,
+    StatementLambdaElement,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from core.config import settings
 from core.models import User
 from core.schemas.users import UserCreate, UserUpdate
 from core.exceptions import (
@@ -12,17 +21,88 @@ from core.exceptions import (
     NoEntityFoundException,
     UniqueConstraintViolationException,
 )
+from utils import TTLCache
 from .groups import check_foreign_key_group_id
 
 __all__ = (
     "check_foreign_key_user_id",
     "create_user",
+    "forget_user_by_access_token",
+    "get_cached_user_by_access_token",
     "get_user_by_access_token",
     "get_user_by_ecourses_id",
     "get_user_by_id",
     "update_user",
 )
 
+# Кэш пользователей, найденных по access_token: access_token -> отсоединенная
+# от сессий копия пользователя
+_users_by_access_token: TTLCache[str, User] = TTLCache(
+    maxsize=settings.auth_cache.maxsize,
+    ttl=settings.auth_cache.user_ttl,
+)
+
+# Кэш access_token, для которых пользователь не найден. Повторные запросы с
+# поддельным или устаревшим токеном не обращаются к БД
+_unknown_access_tokens: TTLCache[str, bool] = TTLCache(
+    maxsize=settings.auth_cache.maxsize,
+    ttl=settings.auth_cache.negative_ttl,
+)
+
+# Незавершенные поиски пользователей по access_token: access_token -> future
+# с отсоединенной копией найденного пользователя (или None)
+_inflight_user_lookups: dict[str, asyncio.Future[Optional[User]]] = {}
+
+
+def _detached_copy(user: User) -> User:
+    """
+    Функция, создающая отсоединенную копию пользователя для кэша.
+
+    Копия не принадлежит ни одной сессии и никогда не изменяется, поэтому
+    может одновременно использоваться разными запросами.
+
+    :param user: пользователь
+    :return: отсоединенная копия пользователя
+    """
+
+    user_copy: User = User(
+        **{
+            attr.key: getattr(user, attr.key)
+            for attr in inspect(User).column_attrs
+        }
+    )
+    make_transient_to_detached(user_copy)
+    return user_copy
+
+
+def forget_user_by_access_token(access_token: str) -> None:
+    """
+    Функция, удаляющая access_token из кэшей найденных и не найденных
+    пользователей.
+
+    :param access_token: access_token пользователя
+    """
+
+    _users_by_access_token.pop(access_token)
+    _unknown_access_tokens.pop(access_token)
+
+
+def get_cached_user_by_access_token(access_token: str) -> Optional[User]:
+    """
+    Функция, получающая пользователя по access_token из кэша, не обращаясь
+    к сессии.
+
+    Возвращаемая копия отсоединена от сессий и используется одновременно
+    разными запросами, поэтому перед изменением ее следует привязать к
+    сессии через merge.
+
+    :param access_token: access_token пользователя
+    :return: отсоединенная копия пользователя, если он есть в кэше, иначе
+        None
+    """
+
+    return _users_by_access_token.get(access_token)
+
 
 # --- Проверка ограничений внешнего ключа ---
 
@@ -140,6 +220,10 @@ async def create_user(
     session.add(user)
     await session.commit()
     await session.refresh(user)
+
+    # Токен мог попасть в кэш не найденных пользователей при проверке
+    # уникальности
+    forget_user_by_access_token(user.access_token)
     return user
 
 
@@ -214,6 +298,11 @@ async def get_user_by_access_token(
 
     Возвращает None, если пользователь впервые авторизуется в системе.
 
+    Найденные пользователи кэшируются на settings.auth_cache.user_ttl
+    секунд, а отсутствие пользователя - на settings.auth_cache.negative_ttl
+    секунд, поэтому повторные запросы с тем же access_token не обращаются к
+    БД.
+
     :param session: сессия подключения к БД
     :param access_token: access_token пользователя
     :param on_login: флаг, указывающий, следует ли функции возвращать None или
@@ -223,10 +312,24 @@ async def get_user_by_access_token(
         access_token не найден
     """
 
-    stmt: Select = select(User).where(User.access_token == access_token)
-    if user := (await session.scalars(stmt)).one_or_none():
-        return user
-    elif on_login:
+    if (
+        cached_user := get_cached_user_by_access_token(access_token)
+    ) is not None:
+        # merge без загрузки создает в текущей сессии собственную копию
+        # пользователя, не обращаясь к БД
+        return await session.merge(cached_user, load=False)
+
+    if not _unknown_access_tokens.get(access_token):
+        # Одновременные поиски одного и того же access_token объединяются в
+        # один запрос к БД
+        if (lookup := _inflight_user_lookups.get(access_token)) is None:
+            user = await _lookup_user_by_access_token(session, access_token)
+        else:
+            user = await _await_user_lookup(session, access_token, lookup)
+        if user:
+            return user
+
+    if on_login:
         return None
     else:
         raise NoEntityFoundException(
@@ -234,6 +337,84 @@ async def get_user_by_access_token(
         )
 
 
+async def _lookup_user_by_access_token(
+    session: AsyncSession,
+    access_token: str,
+) -> Optional[User]:
+    """
+    Функция, ищущая пользователя по access_token в БД.
+
+    Результат записывается в кэши и передается одновременно ожидающим его
+    поискам.
+
+    :param session: сессия подключения к БД
+    :param access_token: access_token пользователя
+    :return: пользователь, если он найден, иначе None
+    """
+
+    lookup: asyncio.Future[Optional[User]] = (
+        asyncio.get_running_loop().create_future()
+    )
+    _inflight_user_lookups[access_token] = lookup
+
+    try:
+        # Запрос выполняется при каждой авторизации с новым токеном, поэтому
+        # он собирается через lambda_stmt: построение выражения и вычисление
+        # ключа кэша компиляции выполняются один раз, а при следующих вызовах
+        # подставляется только значение access_token
+        stmt: StatementLambdaElement = lambda_stmt(
+            lambda: select(User).where(User.access_token == access_token)
+        )
+        user: Optional[User] = (await session.scalars(stmt)).one_or_none()
+    except BaseException:
+        # Ожидающие поиски выполнят запрос самостоятельно
+        lookup.cancel()
+        raise
+    finally:
+        _inflight_user_lookups.pop(access_token, None)
+
+    if user:
+        user_copy: Optional[User] = _detached_copy(user)
+        _users_by_access_token.set(access_token, user_copy)
+    else:
+        user_copy = None
+        _unknown_access_tokens.set(access_token, True)
+
+    lookup.set_result(user_copy)
+    return user
+
+
+async def _await_user_lookup(
+    session: AsyncSession,
+    access_token: str,
+    lookup: asyncio.Future[Optional[User]],
+) -> Optional[User]:
+    """
+    Функция, ожидающая результат уже выполняющегося поиска пользователя по
+    access_token.
+
+    :param session: сессия подключения к БД
+    :param access_token: access_token пользователя
+    :param lookup: future выполняющегося поиска
+    :return: пользователь в текущей сессии, если он найден, иначе None
+    """
+
+    try:
+        # shield - отмена ожидающего запроса не должна отменять поиск для
+        # остальных
+        user_copy: Optional[User] = await asyncio.shield(lookup)
+    except asyncio.CancelledError:
+        if not lookup.cancelled():
+            # Отменен сам ожидающий запрос
+            raise
+        # Поиск завершился ошибкой - выполняем его самостоятельно
+        return await _lookup_user_by_access_token(session, access_token)
+
+    if user_copy is None:
+        return None
+    return await session.merge(user_copy, load=False)
+
+
 # --- Update ---
 
 
@@ -265,8 +446,26 @@ async def update_user(
 
     # ---
 
+    # Токен, по которому пользователь мог быть закэширован
+    cached_access_token: str = user.access_token
+
+    # Пользователь мог быть получен из кэша, копия в котором отстает от БД
+    # на время до settings.auth_cache.user_ttl секунд. Без перезагрузки
+    # новые значения сравнивались бы с устаревшими, и совпадающие с ними
+    # изменения не попадали бы в UPDATE
+    await session.refresh(user)
+    old_access_token: str = user.access_token
+
     for key, value in user_upd.items():
         setattr(user, key, value)
     await session.commit()
+
+    # Кэшированные копии пользователя устарели
+    for access_token in {
+        cached_access_token,
+        old_access_token,
+        user.access_token,
+    }:
+        forget_user_by_access_token(access_token)
     await session.refresh(user)
     return user
@@ -5,27 +5,36 @@
 from datetime import datetime
 from typing import Literal, Optional
 
-from sqlalchemy import func, Select, select
+from sqlalchemy import and_, func, Select, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from core.exceptions import (
     AdminSuicideException,
+    ForeignKeyViolationException,
     NoEntityFoundException,
     SubjectIsOutOfWorkspaceException,
     UniqueConstraintViolationException,
     UserIsNotWorkspaceAdminException,
 )
-from core.models import Queue, Subject, Task, User, WorkspaceMember
+from core.models import (
+    Queue,
+    Subject,
+    Task,
+    User,
+    Workspace,
+    WorkspaceMember,
+)
 from core.schemas.workspace_members import (
     WorkspaceMemberCreate,
     WorkspaceMemberLeaderboardEntry,
     WorkspaceMemberUpdate,
 )
 from crud.users import check_foreign_key_user_id, get_user_by_id
-from crud.workspaces import check_foreign_key_workspace_id
 
 __all__ = (
+    "add_workspace_member",
+    "check_if_user_is_admin_of_existing_workspace",
     "check_if_user_is_workspace_admin",
     "check_if_user_is_workspace_member",
     "create_workspace_member",
@@ -101,6 +110,54 @@ async def check_if_user_is_workspace_admin(
         )
 
 
+async def check_if_user_is_admin_of_existing_workspace(
+    session: AsyncSession,
+    user_id: int,
+    workspace_id: int,
+) -> None:
+    """
+    Функция, проверяющая существование рабочего пространства и то, является
+    ли пользователь его администратором.
+
+    Заменяет последовательный вызов check_foreign_key_workspace_id и
+    check_if_user_is_workspace_admin одним запросом к БД.
+
+    :param session: сессия подключения к БД
+    :param user_id: id пользователя в БД
+    :param workspace_id: id рабочего пространства в БД
+
+    :raises ForeignKeyViolationException: если рабочее пространство не
+        существует
+    :raises UserIsNotWorkspaceAdminException: если пользователь не является
+        администратором рабочего пространства
+    """
+
+    # is_admin равен NULL, если пользователь не состоит в рабочем
+    # пространстве, и строки нет вовсе, если не существует само пространство
+    stmt: Select = (
+        select(WorkspaceMember.is_admin)
+        .select_from(Workspace)
+        .outerjoin(
+            WorkspaceMember,
+            and_(
+                WorkspaceMember.workspace_id == Workspace.id,
+                WorkspaceMember.user_id == user_id,
+            ),
+        )
+        .where(Workspace.id == workspace_id)
+    )
+    if not (row := (await session.execute(stmt)).one_or_none()):
+        raise ForeignKeyViolationException(
+            f"Нарушено ограничение внешнего ключа workspace_id: "
+            f"значение {workspace_id} не существует в столбце id таблицы workspaces."
+        )
+    if not row.is_admin:
+        raise UserIsNotWorkspaceAdminException(
+            f"Пользователь с user_id={user_id} не является администратором "
+            f"рабочего пространства с workspace_id={workspace_id}."
+        )
+
+
 async def check_if_user_is_workspace_member(
     session: AsyncSession,
     user_id: int,
@@ -134,16 +191,20 @@ async def check_if_user_is_workspace_member(
 # --- Create ---
 
 
-async def create_workspace_member(
+async def add_workspace_member(
     session: AsyncSession,
     workspace_member_in: WorkspaceMemberCreate,
+    check_constraints: bool = True,
 ) -> WorkspaceMember:
     """
-    Функция, создающая члена рабочего пространства.
+    Функция, добавляющая члена рабочего пространства в сессию без фиксации
+    транзакции.
 
     :param session: сессия подключения к БД
     :param workspace_member_in: объект pydantic-модели WorkspaceMemberCreate
-    :return: созданный член рабочего пространства
+    :param check_constraints: флаг, определяющий, будут ли проверены внешние
+        ключи и уникальность пары user_id и workspace_id
+    :return: добавленный в сессию член рабочего пространства
 
     :raises UniqueConstraintViolationException: если пара значений user_id и
         workspace_id уже существует
@@ -158,29 +219,56 @@ async def create_workspace_member(
 
     # --- Ограничения уникальности ---
 
-    # Проверка существования внешнего ключа user_id
-    await check_foreign_key_user_id(
-        session,
-        workspace_member.user_id,
-    )
+    if check_constraints:
+        # Проверка существования внешнего ключа user_id
+        await check_foreign_key_user_id(
+            session,
+            workspace_member.user_id,
+        )
 
-    # Проверка существования внешнего ключа workspace_id
-    await check_foreign_key_workspace_id(
-        session,
-        workspace_member.workspace_id,
-    )
+        # Проверка существования внешнего ключа workspace_id
+        await check_foreign_key_workspace_id(
+            session,
+            workspace_member.workspace_id,
+        )
 
-    # Проверка составного ограничения уникальности user_id и workspace_id
-    await check_complex_unique_user_id_workspace_id(
-        session,
-        workspace_member.user_id,
-        workspace_member.workspace_id,
-    )
+        # Проверка составного ограничения уникальности user_id и
+        # workspace_id
+        await check_complex_unique_user_id_workspace_id(
+            session,
+            workspace_member.user_id,
+            workspace_member.workspace_id,
+        )
 
     # ---
 
-    # Запись члена рабочего пространства в БД
     session.add(workspace_member)
+    return workspace_member
+
+
+async def create_workspace_member(
+    session: AsyncSession,
+    workspace_member_in: WorkspaceMemberCreate,
+) -> WorkspaceMember:
+    """
+    Функция, создающая члена рабочего пространства.
+
+    :param session: сессия подключения к БД
+    :param workspace_member_in: объект pydantic-модели WorkspaceMemberCreate
+    :return: созданный член рабочего пространства
+
+    :raises UniqueConstraintViolationException: если пара значений user_id и
+        workspace_id уже существует
+    :raises ForeignKeyViolationException: если внешний ключ
+        user_id/workspace_id не существует
+    """
+
+    workspace_member: WorkspaceMember = await add_workspace_member(
+        session,
+        workspace_member_in,
+    )
+
+    # Запись члена рабочего пространства в БД
     await session.commit()
     await session.refresh(workspace_member)
     return workspace_member
@@ -316,10 +404,6 @@ async def get_workspace_members_by_workspace_id_and_status(
     """
 
     # Проверка существования внешнего ключа workspace_id
-
-    # Во избежание циклического импорта
-    from .workspaces import check_foreign_key_workspace_id
-
     await check_foreign_key_workspace_id(
         session=session,
         workspace_id=workspace_id,
@@ -683,3 +767,7 @@ async def delete_workspace_member(
             )
 
     return workspace_member
+
+
+# Циклический импорт, см. комментарий в конце модуля crud.workspaces
+from crud.workspaces import check_foreign_key_workspace_id
@@ -3,6 +3,7 @@
 from typing import Optional
 
 from sqlalchemy import select, Select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.exceptions import (
@@ -33,6 +34,9 @@ __all__ = (
     "update_workspace",
 )
 
+# Код ошибки PostgreSQL, соответствующий нарушению ограничения уникальности
+UNIQUE_VIOLATION_PGCODE: str = "23505"
+
 
 # --- Проверка ограничений внешнего ключа ---
 
@@ -51,7 +55,10 @@ async def check_foreign_key_workspace_id(
         существует
     """
 
-    if not await get_workspace_by_id(session, workspace_id):
+    # Достаточно проверить наличие строки, не собирая WorkspaceRead (группа,
+    # количество членов)
+    stmt: Select = select(1).where(Workspace.id == workspace_id).limit(1)
+    if not (await session.execute(stmt)).scalar():
         raise ForeignKeyViolationException(
             f"Нарушено ограничение внешнего ключа workspace_id: "
             f"значение {workspace_id} не существует в столбце id таблицы workspaces."
@@ -61,13 +68,17 @@ async def check_foreign_key_workspace_id(
 # --- Проверка ограничений ---
 
 
-async def check_complex_unique_group_id_name(
+async def flush_with_complex_unique_group_id_name_check(
     session: AsyncSession,
     group_id: int,
     name: str,
 ) -> None:
     """
-    Функция, проверяющая уникальность пары значений group_id и name.
+    Функция, сбрасывающая изменения в БД с проверкой уникальности пары
+    значений group_id и name.
+
+    Проверка выполняется самой БД (ограничение uq_workspaces_group_id_name),
+    поэтому отдельный SELECT перед записью не требуется.
 
     :param session: сессия подключения к БД
     :param group_id: id группы
@@ -77,38 +88,17 @@ async def check_complex_unique_group_id_name(
         существует
     """
 
-    stmt: Select = select(Workspace).where(
-        Workspace.group_id == group_id,
-        Workspace.name == name,
-    )
-    if (await session.scalars(stmt)).one_or_none():
-        raise UniqueConstraintViolationException(
-            f"Нарушено комплексное ограничение уникальности в таблице "
-            f"workspaces: пара значений group_id={group_id} и name={name} уже "
-            f"существует в таблице workspaces."
-        )
-
-
-async def check_user_group_id_matches_with_workspace_group_id(
-    user_group_id: Optional[int],
-    workspace_group_id: int,
-) -> bool:
-    """
-    Функция, проверяющая соответствие user.group_id и workspace.group_id.
-
-    :param user_group_id: значение group_id у сущности User
-    :param workspace_group_id: значение group_id у сущности Workspace
-    :return: True если параметры равны
-
-    :raises GroupIDMismatchException: если user.group_id != workspace.group_id
-    """
-
-    if isinstance(user_group_id, int) and user_group_id == workspace_group_id:
-        return True
-    raise GroupIDMismatchException(
-        f"Пользователь с group_id={user_group_id} не может создать рабочее "
-        f"пространство для группы с group_id={workspace_group_id}."
-    )
+    try:
+        await session.flush()
+    except IntegrityError as e:
+        await session.rollback()
+        if getattr(e.orig, "pgcode", None) == UNIQUE_VIOLATION_PGCODE:
+            raise UniqueConstraintViolationException(
+                f"Нарушено комплексное ограничение уникальности в таблице "
+                f"workspaces: пара значений group_id={group_id} и name={name} "
+                f"уже существует в таблице workspaces."
+            ) from e
+        raise
 
 
 # --- Create ---
@@ -134,27 +124,26 @@ async def create_workspace(
         workspace_in["group_id"] и workspace_in["name"] уже существует
     """
 
-    # Распаковка pydantic-модели в SQLAlchemy-модель
-    workspace: Workspace = Workspace(**workspace_in.model_dump())
-
     # --- Ограничение на создание рабочего пространства для пользователя ---
 
-    await check_user_group_id_matches_with_workspace_group_id(
-        user_group_id=current_user.group_id,
-        workspace_group_id=workspace.group_id,
-    )
+    # Пользователь без группы (group_id=None) также не проходит проверку
+    if current_user.group_id != workspace_in.group_id:
+        raise GroupIDMismatchException(
+            f"Пользователь с group_id={current_user.group_id} не может "
+            f"создать рабочее пространство для группы с "
+            f"group_id={workspace_in.group_id}."
+        )
+
+    # Распаковка pydantic-модели в SQLAlchemy-модель
+    workspace: Workspace = Workspace(**workspace_in.model_dump())
 
     # --- Ограничения уникальности ---
 
     # Проверка существования внешнего ключа group_id
     await check_foreign_key_group_id(session, workspace.group_id)
 
-    # Проверка составного ограничения уникальности group_id и name
-    await check_complex_unique_group_id_name(
-        session,
-        workspace.group_id,
-        workspace.name,
-    )
+    # Составное ограничение уникальности group_id и name проверяется БД при
+    # записи рабочего пространства
 
     # ---
 
@@ -166,25 +155,31 @@ async def create_workspace(
     )
     semester = extract_semester_from_group_name(group.name)
 
-    # Запись рабочего пространства в БД
+    # Запись рабочего пространства и его администратора в БД одной
+    # транзакцией. flush получает id рабочего пространства через
+    # INSERT ... RETURNING, created_at и updated_at заполняются на стороне
+    # приложения (expire_on_commit=False сохраняет их после фиксации)
     session.add(workspace)
-    await session.commit()
-    await session.refresh(workspace)
-
-    # Запись члена рабочего пространства в БД
-
-    # Во избежание циклического импорта
-    from .workspace_members import create_workspace_member
+    await flush_with_complex_unique_group_id_name_check(
+        session,
+        workspace.group_id,
+        workspace.name,
+    )
 
-    await create_workspace_member(
-        session=session,
-        workspace_member_in=WorkspaceMemberCreate(
+    # Проверки ограничений не нужны: пользователь текущий, рабочее
+    # пространство только что создано, а значит пара user_id и workspace_id
+    # уникальна
+    await add_workspace_member(
+        session,
+        WorkspaceMemberCreate(
             is_admin=True,
             status="approved",
             user_id=current_user.id,
             workspace_id=workspace.id,
         ),
+        check_constraints=False,
     )
+    await session.commit()
 
     return WorkspaceRead(
         id=workspace.id,
@@ -200,6 +195,67 @@ async def create_workspace(
 # --- Read ---
 
 
+async def build_workspace_read(
+    session: AsyncSession,
+    workspace: Workspace,
+) -> WorkspaceRead:
+    """
+    Функция, собирающая pydantic-модель WorkspaceRead из orm-модели.
+
+    :param session: сессия подключения к БД
+    :param workspace: orm-модель рабочего пространства
+    :return: рабочее пространство с вычисленными семестром и количеством
+        членов
+    """
+
+    # Вычисление текущего семестра по названию группы
+    # noinspection PyTypeChecker
+    group: Group = await get_group_by_id(
+        session,
+        workspace.group_id,
+        constraint_check=False,
+    )
+    semester = extract_semester_from_group_name(group.name)
+
+    # noinspection PyTypeChecker
+    return WorkspaceRead(
+        id=workspace.id,
+        name=workspace.name,
+        group_id=workspace.group_id,
+        semester=semester,
+        created_at=workspace.created_at,
+        updated_at=workspace.updated_at,
+        members_count=await get_workspace_members_count_by_workspace_id(
+            session=session,
+            workspace_id=workspace.id,
+        ),
+    )
+
+
+async def get_workspace_orm_model_by_id(
+    session: AsyncSession,
+    workspace_id: int,
+) -> Workspace:
+    """
+    Функция, возвращающая orm-модель рабочего пространства по его id.
+
+    Используется операциями, которым нужна и orm-, и pydantic-модель, чтобы
+    не загружать рабочее пространство дважды.
+
+    :param session: сессия подключения к БД
+    :param workspace_id: id рабочего пространства
+    :return: orm-модель рабочего пространства
+
+    :raises NoEntityFoundException: если рабочее пространство не найдено
+    """
+
+    if workspace := await session.get(Workspace, workspace_id):
+        return workspace
+    raise NoEntityFoundException(
+        f"Рабочее пространство с id={workspace_id} не найдено."
+    )
+
+
 async def get_workspace_by_id(
     session: AsyncSession,
     workspace_id: int,
@@ -218,34 +274,7 @@ async def get_workspace_by_id(
     """
 
     if workspace := await session.get(Workspace, workspace_id):
-        # Во избежание циклического импорта
-        from .workspace_members import (
-            get_workspace_members_count_by_workspace_id,
-        )
-
-        # Вычисление текущего семестра по названию группы
-        # noinspection PyTypeChecker
-        group: Group = await get_group_by_id(
-            session,
-            workspace.group_id,
-            constraint_check=False,
-        )
-        semester = extract_semester_from_group_name(group.name)
-
-        # noinspection PyTypeChecker
-        return WorkspaceRead(
-            id=workspace.id,
-            name=workspace.name,
-            group_id=workspace.group_id,
-            semester=semester,
-            created_at=workspace.created_at,
-            updated_at=workspace.updated_at,
-            members_count=await get_workspace_members_count_by_workspace_id(
-                session=session,
-                workspace_id=workspace_id,
-            ),
-        )
-
+        return await build_workspace_read(session, workspace)
     elif constraint_check:
         # Возвращаем None для того, чтобы функция check_foreign_key_workspace_id
         # выбросила свое исключение
@@ -271,9 +300,6 @@ async def get_workspaces_which_user_is_member_of(
     :return: список рабочих пространств, в которых пользователь является членом
     """
 
-    # Во избежание циклического импорта
-    from .workspace_members import get_workspace_members_by_user_id
-
     user_memberships: list[WorkspaceMember] = (
         await get_workspace_members_by_user_id(
             session=session,
@@ -321,35 +347,7 @@ async def get_available_workspaces(
 
     workspaces = (await session.scalars(stmt)).all()
 
-    result: list[WorkspaceRead] = []
-    for ws in workspaces:
-        group = await get_group_by_id(
-            session,
-            ws.group_id,
-            constraint_check=False,
-        )
-        semester = extract_semester_from_group_name(group.name)
-
-        from .workspace_members import (
-            get_workspace_members_count_by_workspace_id,
-        )
-
-        result.append(
-            WorkspaceRead(
-                id=ws.id,
-                group_id=ws.group_id,
-                name=ws.name,
-                semester=semester,
-                members_count=await get_workspace_members_count_by_workspace_id(
-                    session=session,
-                    workspace_id=ws.id,
-                ),
-                created_at=ws.created_at,
-                updated_at=ws.updated_at,
-            )
-        )
-
-    return result
+    return [await build_workspace_read(session, ws) for ws in workspaces]
 
 
 # --- Update ---
@@ -382,41 +380,26 @@ async def update_workspace(
     # Исключение не заданных явно атрибутов
     workspace_upd: dict = workspace_upd.model_dump(exclude_unset=True)
 
-    workspace_pydantic_model: WorkspaceRead = await get_workspace_by_id(
+    # Получение рабочего пространства включает проверку на его существование
+    # pydantic-модель собирается из уже загруженной orm-модели
+    workspace_orm_model: Workspace = await get_workspace_orm_model_by_id(
         session,
         workspace_id,
-        constraint_check=False,
     )
-
-    # noinspection PyTypeChecker
-    # None не вернется, т.к. эта проверка произошла в get_workspace_by_id
-    workspace_orm_model: Workspace = await session.get(Workspace, workspace_id)
+    workspace_pydantic_model: WorkspaceRead = await build_workspace_read(
+        session,
+        workspace_orm_model,
+    )
 
     # --- Ограничения уникальности ---
 
     # Проверка, что пользователь является администратором рабочего пространства
-    # Во избежание циклического импорта
-    from .workspace_members import check_if_user_is_workspace_admin
-
     await check_if_user_is_workspace_admin(
         session,
         current_user_id,
         workspace_id,
     )
 
-    # Проверка пришедшего имени на уникальность в рамках данной группы
-    if (
-        "name" in workspace_upd
-        and workspace_upd["name"] is not None
-        # Если пришло то же имя, что уже записано, то пропускаем проверку
-        and workspace_upd["name"] != workspace_orm_model.name
-    ):
-        await check_complex_unique_group_id_name(
-            session,
-            workspace_pydantic_model.group_id,
-            workspace_upd["name"],
-        )
-
     # ---
 
     for key, value in workspace_upd.items():
@@ -424,8 +407,18 @@ async def update_workspace(
         setattr(workspace_orm_model, key, value)
         # Обновление атрибутов в pydantic-модели
         setattr(workspace_pydantic_model, key, value)
+
+    # Уникальность пришедшего имени в рамках данной группы проверяется БД при
+    # сбросе изменений
+    await flush_with_complex_unique_group_id_name_check(
+        session,
+        workspace_orm_model.group_id,
+        workspace_orm_model.name,
+    )
     await session.commit()
-    await session.refresh(workspace_orm_model)
+    # refresh не требуется: updated_at вычисляется на стороне приложения и
+    # записывается в orm-модель при сбросе изменений
+    workspace_pydantic_model.updated_at = workspace_orm_model.updated_at
     return workspace_pydantic_model
 
 
@@ -451,24 +444,21 @@ async def delete_workspace(
     """
 
     # Получение рабочего пространства включает проверку на его существование
-    workspace_pydantic_model: WorkspaceRead = await get_workspace_by_id(
+    # pydantic-модель собирается из уже загруженной orm-модели
+    workspace_orm_model: Workspace = await get_workspace_orm_model_by_id(
         session,
         workspace_id,
-        constraint_check=False,
     )
-
-    # noinspection PyTypeChecker
-    # None не вернется, т.к. эта проверка произошла в get_workspace_by_id
-    workspace_orm_model: Workspace = await session.get(Workspace, workspace_id)
+    workspace_pydantic_model: WorkspaceRead = await build_workspace_read(
+        session,
+        workspace_orm_model,
+    )
 
     # ---
     # Провека ограничения на удаление рабочего пространства только его
     # администратором
     # ---
 
-    # Во избежание циклического импорта
-    from .workspace_members import check_if_user_is_workspace_admin
-
     await check_if_user_is_workspace_admin(session, user_id, workspace_id)
 
     # ---
@@ -477,3 +467,14 @@ async def delete_workspace(
     await session.delete(workspace_orm_model)
     await session.commit()
     return workspace_pydantic_model
+
+
+# Модули workspaces и workspace_members ссылаются друг на друга. Импорт
+# выполняется после определения всех функций модуля, поэтому работает при
+# любом порядке загрузки модулей и не повторяется при каждом вызове
+from crud.workspace_members import (
+    add_workspace_member,
+    check_if_user_is_workspace_admin,
+    get_workspace_members_by_user_id,
+    get_workspace_members_count_by_workspace_id,
+)
@@ -1,5 +1,6 @@
 """Модуль, содержащий схемы ошибок."""
 
+from functools import lru_cache
 from typing import Any, Union
 
 from fastapi import status
@@ -64,22 +65,25 @@ def generate_error_content_block_for_swagger(
     }
 
 
+# Схемы ошибок собираются один раз при импорте модуля и переиспользуются
+# всеми эндпоинтами
+_PRECOMPUTED_CONTENT_BLOCKS: dict[int, dict[str, Any]] = {
+    code: generate_error_content_block_for_swagger(**description)
+    for code, description in _CODES_DESCRIPTIONS.items()
+}
+
+
+@lru_cache(maxsize=None)
 def generate_responses_for_swagger(
     codes: Union[tuple[int, ...], tuple[Any, ...]],
 ) -> dict[int, dict[str, Any]]:
     """
     Функция, возвращающая словарь со схемами ошибок для Swagger UI.
 
+    Результат кэшируется по кортежу кодов.
+
     :param codes: кортеж с кодами ошибок
     :return: словарь со схемами ошибок
     """
 
-    responses: dict[int, dict[str, Any]] = {}
-    for code in codes:
-        responses[code] = generate_error_content_block_for_swagger(
-            description=_CODES_DESCRIPTIONS[code]["description"],
-            message=_CODES_DESCRIPTIONS[code]["message"],
-            error=_CODES_DESCRIPTIONS[code]["error"],
-        )
-
-    return responses
+    return {code: _PRECOMPUTED_CONTENT_BLOCKS[code] for code in codes}
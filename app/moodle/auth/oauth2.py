@@ -2,20 +2,47 @@
 
 from typing import Annotated, Optional
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
-from core.exceptions import AccessTokenException
+from core.exceptions import (
+    AccessTokenException,
+    UnclassifiedMoodleException,
+)
 from core.models import User, db_helper
-from crud.users import get_user_by_access_token
+from crud.users import (
+    forget_user_by_access_token,
+    get_cached_user_by_access_token,
+    get_user_by_access_token,
+)
 from moodle.auth import check_access_token_persistence
 
+# Максимальная длина access_token, которая может храниться в БД
+ACCESS_TOKEN_MAX_LENGTH: int = User.__table__.c.access_token.type.length
+
 
 class MoodleOAuth2(OAuth2PasswordBearer):
     """Класс, реализующий кастомную OAuth2 авторизацию через еКурсы."""
 
+    async def __call__(self, request: Request) -> Optional[str]:
+        """
+        Метод, извлекающий access_token из заголовка Authorization.
+
+        Заголовок вида "Bearer <access_token>", который присылают клиенты,
+        разбирается напрямую. Остальные варианты (другой регистр схемы,
+        отсутствие заголовка) обрабатываются стандартной реализацией.
+
+        :param request: объект запроса
+        :return: access_token или None, если он не передан
+        """
+
+        authorization: Optional[str] = request.headers.get("Authorization")
+        if authorization and authorization.startswith("Bearer "):
+            return authorization[7:]
+        return await super().__call__(request)
+
     @staticmethod
     async def validate_access_token(
         access_token: str, session: AsyncSession
@@ -24,8 +51,14 @@ class MoodleOAuth2(OAuth2PasswordBearer):
         Метод, проверяющий существование пользователя и валидность
         access_token.
 
+        Пользователь берется из кэша, а при промахе ищется в отдельной
+        короткой сессии без транзакции, поэтому подключение к БД
+        возвращается в пул до обращения к еКурсам, а сессия запроса не
+        занимает подключение до своего первого запроса.
+
         :param access_token: access_token пользователя
-        :param session: сессия подключения к БД
+        :param session: сессия подключения к БД, к которой будет привязан
+            возвращаемый пользователь
         :return: авторизованный пользователь в случае успеха, в противном
             случае выбрасывается исключение
 
@@ -35,20 +68,41 @@ class MoodleOAuth2(OAuth2PasswordBearer):
             не найден
         """
 
-        if user := await get_user_by_access_token(
-            session=session,
-            access_token=access_token,
-            on_login=True,
-        ):
-            # Если пользователь найден, то проверяем его access_token
-            # В случае успеха исключение не будет выброшено
-            await check_access_token_persistence(access_token)
-        else:
+        # Пустой токен (в том числе отсутствующий заголовок Authorization) или
+        # токен длиннее столбца access_token не может принадлежать ни одному
+        # пользователю, поэтому кэши и БД не проверяются
+        if not access_token or len(access_token) > ACCESS_TOKEN_MAX_LENGTH:
+            raise AccessTokenException(
+                "Ошибка при попытке авторизации в eQueue."
+            )
+
+        user: Optional[User] = get_cached_user_by_access_token(access_token)
+        if user is None:
+            async with db_helper.autocommit_session_factory() as auth_session:
+                user = await get_user_by_access_token(
+                    session=auth_session,
+                    access_token=access_token,
+                    on_login=True,
+                )
+
+        if user is None:
             # Если пользователь не найден, то выбрасываем исключение
             raise AccessTokenException(
                 "Ошибка при попытке авторизации в eQueue."
             )
-        return user
+
+        # Если пользователь найден, то проверяем его access_token
+        # В случае успеха исключение не будет выброшено
+        try:
+            await check_access_token_persistence(access_token)
+        except UnclassifiedMoodleException:
+            forget_user_by_access_token(access_token)
+            raise
+
+        # Пользователь из кэша или закрытой сессии поиска отсоединен от
+        # сессий. merge без загрузки привязывает его к сессии запроса, не
+        # обращаясь к БД
+        return await session.merge(user, load=False)
 
 
 oauth2_scheme = MoodleOAuth2(
@@ -1,14 +1,25 @@
 """Модуль, содержащий функции для работы с авторизацией через еКурсы."""
 
+import asyncio
+from functools import partial
 from urllib.parse import quote_plus as url_encode
 
-import httpx
-from httpx import Response
-
 from core.config import settings
+from core.exceptions import UnclassifiedMoodleException
 from core.middlewares.logs import logger
 from core.schemas.users import UserInfoFromEcourses, UserLogin
 from moodle import validate_ecourses_response
+from moodle.http import coalesce, moodle_client, parse_moodle_response
+from utils import TTLCache
+
+# Кэш успешных проверок access_token: access_token -> ответ еКурсов
+_user_info_cache: TTLCache[str, dict] = TTLCache(
+    maxsize=settings.auth_cache.maxsize,
+    ttl=settings.auth_cache.ttl,
+)
+
+# Незавершенные проверки access_token: access_token -> задача запроса
+_inflight_user_info: dict[str, asyncio.Task] = {}
 
 
 async def auth_by_moodle_credentials(credentials: UserLogin) -> str:
@@ -24,17 +35,16 @@ async def auth_by_moodle_credentials(credentials: UserLogin) -> str:
         сообщение об ошибке
     """
 
-    async with httpx.AsyncClient() as client:
-        url: str = settings.moodle.auth_url % (
-            url_encode(credentials.login),
-            url_encode(credentials.password),
-        )
+    url: str = settings.moodle.auth_url % (
+        url_encode(credentials.login),
+        url_encode(credentials.password),
+    )
 
-        response = await client.get(url)
-        response_json = response.json()
+    response_json = parse_moodle_response(await moodle_client.get(url))
 
-    logger.info(
-        "Intermediate request to %s: %s",
+    logger.info("Intermediate request to %s", url)
+    logger.debug(
+        "Intermediate response from %s: %s",
         url,
         response_json,
     )
@@ -60,7 +70,12 @@ async def get_moodle_user_info(access_token: str) -> UserInfoFromEcourses:
         сообщение об ошибке
     """
 
-    response_json: dict = await check_access_token_persistence(access_token)
+    # Данные профиля при авторизации всегда запрашиваются у еКурсов, так как
+    # в кэше проверок может храниться ответ, полученный до изменения профиля
+    response_json: dict = await check_access_token_persistence(
+        access_token,
+        use_cache=False,
+    )
 
     return UserInfoFromEcourses(
         access_token=access_token,
@@ -71,9 +86,11 @@ async def get_moodle_user_info(access_token: str) -> UserInfoFromEcourses:
     )
 
 
-async def check_access_token_persistence(access_token: str) -> dict:
+async def _request_user_info(access_token: str) -> dict:
     """
-    Функция, проверяющая "жив" ли access_token.
+    Функция, запрашивающая у еКурсов информацию о владельце access_token.
+
+    Успешный ответ записывается в кэш проверок access_token.
 
     :param access_token: access_token пользователя
     :return: json-объект с информацией о пользователе
@@ -82,17 +99,57 @@ async def check_access_token_persistence(access_token: str) -> dict:
         сообщение об ошибке
     """
 
-    async with httpx.AsyncClient() as client:
-        url: str = settings.moodle.get_user_info_url % url_encode(access_token)
-        response: Response = await client.get(url)
-        response_json: dict = response.json()
+    url: str = settings.moodle.get_user_info_url % url_encode(access_token)
+    response_json: dict = parse_moodle_response(await moodle_client.get(url))
 
-    logger.info(
-        "[TKN_HLTH_CHCK] Intermediate request to %s: %s",
+    logger.info("[TKN_HLTH_CHCK] Intermediate request to %s", url)
+    logger.debug(
+        "[TKN_HLTH_CHCK] Intermediate response from %s: %s",
         url,
         response_json,
     )
 
-    await validate_ecourses_response(response_json)
+    try:
+        await validate_ecourses_response(response_json)
+    except UnclassifiedMoodleException:
+        # Токен больше не действителен - забываем о нем
+        _user_info_cache.pop(access_token)
+        raise
 
+    _user_info_cache.set(access_token, response_json)
     return response_json
+
+
+async def check_access_token_persistence(
+    access_token: str,
+    use_cache: bool = True,
+) -> dict:
+    """
+    Функция, проверяющая "жив" ли access_token.
+
+    Успешные ответы еКурсов кэшируются на settings.auth_cache.ttl секунд,
+    поэтому повторные проверки одного токена не обращаются к еКурсам.
+    Одновременные проверки одного и того же токена объединяются в один
+    запрос к еКурсам.
+
+    :param access_token: access_token пользователя
+    :param use_cache: флаг, определяющий, может ли быть использован ответ из
+        кэша. Если False, запрос к еКурсам отправляется всегда, а его
+        успешный ответ обновляет кэш
+    :return: json-объект с информацией о пользователе
+
+    :raises UnclassifiedMoodleException: если ответ от еКурсов содержит
+        сообщение об ошибке
+    """
+
+    if not use_cache:
+        return await _request_user_info(access_token)
+
+    if (cached_json := _user_info_cache.get(access_token)) is not None:
+        return cached_json
+
+    return await coalesce(
+        _inflight_user_info,
+        access_token,
+        partial(_request_user_info, access_token),
+    )
@@ -0,0 +1,145 @@
+"""Модуль, содержащий общий HTTP-клиент для запросов к REST API еКурсов."""
+
+import asyncio
+from functools import partial
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+import httpx
+import orjson
+
+from core.config import settings
+
+__all__ = (
+    "coalesce",
+    "coalesced_get",
+    "coalesced_get_json",
+    "moodle_client",
+    "parse_moodle_response",
+    "retrieve_task_exception",
+)
+
+
+# Клиент переиспользует TCP/TLS-соединения с еКурсами между запросами,
+# поэтому рукопожатие выполняется только при открытии нового соединения.
+# Закрывается при завершении работы приложения
+moodle_client: httpx.AsyncClient = httpx.AsyncClient(
+    http2=settings.moodle_client.http2,
+    timeout=settings.moodle_client.timeout,
+    limits=httpx.Limits(
+        max_connections=settings.moodle_client.max_connections,
+        max_keepalive_connections=(
+            settings.moodle_client.max_keepalive_connections
+        ),
+    ),
+)
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+
+# Незавершенные GET-запросы к еКурсам: url -> задача запроса
+_inflight_requests: dict[str, asyncio.Task[httpx.Response]] = {}
+
+
+def retrieve_task_exception(task: asyncio.Task) -> None:
+    """
+    Функция, забирающая исключение завершенной задачи, результат которой
+    может никем не ожидаться.
+
+    Забранное исключение не попадает в лог как необработанное.
+
+    :param task: завершенная задача
+    """
+
+    if not task.cancelled():
+        task.exception()
+
+
+def _forget_inflight_task(
+    inflight: dict[K, asyncio.Task[T]],
+    key: K,
+    task: asyncio.Task[T],
+) -> None:
+    """
+    Функция, удаляющая завершенную задачу из словаря незавершенных задач.
+
+    :param inflight: словарь незавершенных задач
+    :param key: ключ задачи
+    :param task: завершенная задача
+    """
+
+    inflight.pop(key, None)
+    # Все ожидающие задачу могли быть отменены
+    retrieve_task_exception(task)
+
+
+async def coalesce(
+    inflight: dict[K, asyncio.Task[T]],
+    key: K,
+    request: Callable[[], Awaitable[T]],
+) -> T:
+    """
+    Функция, объединяющая одновременные запросы с одинаковым ключом.
+
+    Первый вызов запускает request() в отдельной задаче, остальные вызовы с
+    тем же ключом ожидают ее результат, пока задача не завершится.
+
+    :param inflight: словарь незавершенных задач, общий для всех вызовов
+    :param key: ключ запроса
+    :param request: функция, создающая корутину запроса
+    :return: результат запроса
+    """
+
+    if (task := inflight.get(key)) is None:
+        task = asyncio.create_task(request())
+        task.add_done_callback(partial(_forget_inflight_task, inflight, key))
+        inflight[key] = task
+
+    # shield - отмена одного из ожидающих (например, при разрыве соединения
+    # клиентом) не должна отменять запрос для остальных
+    return await asyncio.shield(task)
+
+
+async def coalesced_get(url: str) -> httpx.Response:
+    """
+    Функция, отправляющая GET-запрос к еКурсам.
+
+    Одновременные запросы по одному и тому же url объединяются в один запрос
+    к еКурсам, ответ которого получают все ожидающие.
+
+    :param url: url запроса
+    :return: ответ еКурсов
+    """
+
+    return await coalesce(
+        _inflight_requests,
+        url,
+        partial(moodle_client.get, url),
+    )
+
+
+def parse_moodle_response(response: httpx.Response) -> Any:
+    """
+    Функция, разбирающая тело ответа еКурсов.
+
+    Использует orjson вместо stdlib json, на котором основан
+    httpx.Response.json().
+
+    :param response: ответ еКурсов
+    :return: json-объект из тела ответа
+    """
+
+    return orjson.loads(response.content)
+
+
+async def coalesced_get_json(url: str) -> Any:
+    """
+    Функция, отправляющая GET-запрос к еКурсам и разбирающая тело ответа.
+
+    Сам ответ не возвращается, поэтому его тело освобождается сразу после
+    разбора, а не удерживается вместе с json-объектом до конца обработки.
+
+    :param url: url запроса
+    :return: json-объект из тела ответа
+    """
+
+    return parse_moodle_response(await coalesced_get(url))
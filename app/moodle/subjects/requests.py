@@ -1,17 +1,20 @@
 """Модуль, содержащий функции для работы с предметами с еКурсов."""
 
+import asyncio
+from operator import itemgetter
 from urllib.parse import quote_plus as url_encode
 
-import httpx
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.config import settings
 from core.models import User
 from core.schemas.subjects import EcoursesSubjectDescription, SubjectCreate
 from crud.subjects import get_subjects_by_workspace_id
-from crud.workspace_members import check_if_user_is_workspace_admin
-from crud.workspaces import check_foreign_key_workspace_id
+from crud.workspace_members import (
+    check_if_user_is_admin_of_existing_workspace,
+)
 from moodle import validate_ecourses_response
+from moodle.http import coalesced_get_json, retrieve_task_exception
 
 
 async def get_user_enrolled_courses(
@@ -36,51 +39,75 @@ async def get_user_enrolled_courses(
         сообщение об ошибке
     """
 
-    # Проверка сущестования рабочего пространства
-    await check_foreign_key_workspace_id(session, target_workspace_id)
-
-    # Проверка является ли пользователь администратором рабочего пространства,
-    # для которого запрашивает курсы
-    await check_if_user_is_workspace_admin(
-        session, user.id, target_workspace_id
-    )
-
     url = settings.moodle.enrolled_courses_url % (
         url_encode(user.access_token),
-        url_encode(str(user.ecourses_id)),
+        user.ecourses_id,
     )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
-        response_json = response.json()
+    # Запрос к еКурсам не зависит от проверок в БД, поэтому он отправляется
+    # сразу и выполняется, пока идут запросы к БД. Сами запросы к БД
+    # выполняются последовательно, так как сессия не допускает параллельных
+    # запросов
+    moodle_request: asyncio.Task = asyncio.create_task(coalesced_get_json(url))
+
+    try:
+        # Проверка сущестования рабочего пространства и того, является ли
+        # пользователь администратором рабочего пространства, для которого
+        # запрашивает курсы
+        await check_if_user_is_admin_of_existing_workspace(
+            session, user.id, target_workspace_id
+        )
 
-    if not isinstance(response, list):
+        # Исключение курсов, уже добавленных в базу данных
+        # Существование рабочего пространства уже проверено
+        existing_subjects = await get_subjects_by_workspace_id(
+            session=session,
+            workspace_id=target_workspace_id,
+            check_foreign_key=False,
+        )
+    except BaseException:
+        # Результат запроса к еКурсам больше не нужен
+        moodle_request.cancel()
+        # Если запрос уже завершился ошибкой, cancel() ничего не делает -
+        # исключение забирается, чтобы оно не попало в лог как необработанное
+        moodle_request.add_done_callback(retrieve_task_exception)
+        raise
+
+    response_json = await moodle_request
+
+    # Успешный ответ - список, ошибка приходит словарем
+    if not isinstance(response_json, list):
         await validate_ecourses_response(response_json)
 
-    # Исключение курсов, уже добавленных в базу данных
-    existing_subjects = await get_subjects_by_workspace_id(
-        session=session,
-        workspace_id=target_workspace_id,
-    )
     existing_ids = {sub.ecourses_id for sub in existing_subjects}
 
+    # Описания курсов используются только для сортировки, а итоговый список
+    # SubjectCreate валидируется при создании и в response_model эндпоинта,
+    # поэтому описания собираются без валидации
+    fields = EcoursesSubjectDescription.model_fields
     courses = []
     for course in response_json:
         if course.get("lastaccess") is None:
             course["lastaccess"] = -1
 
         if course["id"] not in existing_ids:
-            courses.append(EcoursesSubjectDescription.model_validate(course))
+            # Ключ сортировки по приоритету пользователя вычисляется сразу
+            # при разборе курса
+            courses.append(
+                (
+                    (
+                        course.get("hidden"),
+                        -course["lastaccess"],
+                        not course.get("isfavourite"),
+                    ),
+                    EcoursesSubjectDescription.model_construct(
+                        **{field: course.get(field) for field in fields}
+                    ),
+                )
+            )
 
     # Сортировка по приоритету пользователя
-    sorted_courses = sorted(
-        courses,
-        key=lambda c: (
-            c.hidden,
-            -c.lastaccess,
-            not c.isfavourite,
-        ),
-    )
+    courses.sort(key=itemgetter(0))
 
     return [
         SubjectCreate(
@@ -92,5 +119,5 @@ async def get_user_enrolled_courses(
             professor_requirements=None,
             name=course.shortname,
         )
-        for course in sorted_courses
+        for _, course in courses
     ]
@@ -1,6 +1,6 @@
 """Модуль, содержащий функции для работы с заданиями по предметам с еКурсов."""
 
-import httpx
+from urllib.parse import quote_plus as url_encode
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -8,26 +8,7 @@ from core.config import settings
 from core.models import Task, User
 from core.schemas.tasks import TaskCreate
 from moodle import validate_ecourses_response
-
-from urllib.parse import quote_plus as url_encode
-
-
-async def _has_duplicate(
-    assignments: list[TaskCreate],
-    name: str,
-) -> bool:
-    """
-    Функция, проверяющая наличие дубликатов заданий по их именам.
-
-    :param assignments: список заданий
-    :param name: наименование задания, по которому происходит сравнение
-    :return: True - если дубликат есть, False - если нет
-    """
-
-    for assignment in assignments:
-        if assignment.name == name:
-            return True
-    return False
+from moodle.http import coalesced_get_json
 
 
 async def get_tasks_from_course_structure(
@@ -51,14 +32,13 @@ async def get_tasks_from_course_structure(
 
     url = settings.moodle.course_structure_url % (
         url_encode(current_user.access_token),
-        url_encode(str(subject_ecourses_id)),
+        subject_ecourses_id,
     )
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url)
-        response_json = response.json()
+    response_json = await coalesced_get_json(url)
 
-    if not isinstance(response, list):
+    # Успешный ответ - список, ошибка приходит словарем
+    if not isinstance(response_json, list):
         await validate_ecourses_response(response_json)
 
     # Получение уже имеющихся заданий по данному предмету для дальнейшего
@@ -71,31 +51,34 @@ async def get_tasks_from_course_structure(
         current_user=current_user,
     )
 
-    existing_task_names: list[str] = [task.name for task in existing_tasks]
+    existing_task_names: set[str] = {task.name for task in existing_tasks}
 
     result = []
-    for structure_node in response.json():
+    # Наименования заданий, уже попавших в result
+    seen_task_names: set[str] = set()
+    for structure_node in response_json:
         for module in structure_node["modules"]:
-            if module["modname"] == "assign":  # assign - прикрепляемое задание
+            # assign - прикрепляемое задание
+            # Остальные модули отфильтровываются еКурсами по опции modname, но
+            # проверка сохранена на случай, если опция будет проигнорирована
+            if module["modname"] == "assign":
                 # Проверка дубликтов в рамках текущего парсинга
                 module["name"] = module["name"].strip()
-                if await _has_duplicate(
-                    result,
-                    module["name"],
-                ):
+                if module["name"] in seen_task_names:
                     module["name"] += f" ({structure_node["name"]})"
 
                 # Проверка дубликатов среди уже имеющихся заданий
                 if module["name"] in existing_task_names:
                     continue
 
+                seen_task_names.add(module["name"])
+                # Список заданий валидируется response_model эндпоинта,
+                # поэтому здесь задания собираются без валидации
                 result.append(
-                    TaskCreate.model_validate(
-                        {
-                            "subject_id": subject_id,
-                            "name": module["name"],
-                            "url": module["url"],
-                        }
+                    TaskCreate.model_construct(
+                        subject_id=subject_id,
+                        name=module["name"],
+                        url=module["url"],
                     )
                 )
 
@@ -1,13 +1,11 @@
 """Модуль, содержащий функции для работы с пользователями еКурсов."""
 
-import httpx
-from httpx import Response
+from urllib.parse import quote_plus as url_encode
 
 from core.config import settings
 from core.middlewares.logs import logger
 from moodle import validate_ecourses_response
-
-from urllib.parse import quote_plus as url_encode
+from moodle.http import moodle_client, parse_moodle_response
 
 
 async def upload_new_profile_avatar(
@@ -26,13 +24,14 @@ async def upload_new_profile_avatar(
         сообщение об ошибке
     """
 
-    async with httpx.AsyncClient() as client:
-        url: str = settings.moodle.upload_file_url % url_encode(token)
-        response: Response = await client.post(url, files=files)
-        response_json = response.json()
+    url: str = settings.moodle.upload_file_url % url_encode(token)
+    response_json = parse_moodle_response(
+        await moodle_client.post(url, files=files)
+    )
 
-    logger.info(
-        "Intermediate request to %s: %s",
+    logger.info("Intermediate request to %s", url)
+    logger.debug(
+        "Intermediate response from %s: %s",
         url,
         response_json,
     )
@@ -51,15 +50,19 @@ async def upload_new_profile_avatar(
     }
 
     # Отправка второго запроса для обновления данных пользователя
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
+    response_json = parse_moodle_response(
+        await moodle_client.post(
             settings.moodle.ecourses_base_url,
             data=upd_data,
         )
-        response_json = response.json()
+    )
 
     logger.info(
-        "Intermediate request to %s: %s",
+        "Intermediate request to %s",
+        settings.moodle.ecourses_base_url,
+    )
+    logger.debug(
+        "Intermediate response from %s: %s",
         settings.moodle.ecourses_base_url,
         response_json,
     )
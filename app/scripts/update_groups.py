@@ -1,6 +1,7 @@
 import asyncio
 import os
-import requests
+
+import httpx
 from dotenv import load_dotenv
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import create_async_engine
@@ -10,35 +11,36 @@ DATABASE_URL = os.getenv("APP_CONFIG__DB__URL")
 engine = create_async_engine(DATABASE_URL)
 
 
-def _fetch_raw_groups() -> list[str]:
-    response = requests.get(
-        "https://edu.sfu-kras.ru/api/timetable/get_insts", verify=False
-    )
+async def _fetch_raw_groups() -> list[str]:
+    async with httpx.AsyncClient(verify=False) as client:
+        response = await client.get(
+            "https://edu.sfu-kras.ru/api/timetable/get_insts"
+        )
     response.raise_for_status()
     raw_data = response.json()
 
-    unique_groups = []
+    # dict сохраняет порядок добавления и проверяет наличие ключа за O(1)
+    unique_groups: dict[str, None] = {}
     for group in raw_data:
         base_name = group["name"].split(" (")[0] + " (Глобальная группа)"
-        if base_name not in unique_groups:
-            unique_groups.append(base_name)
-        if group["name"] not in unique_groups:
-            unique_groups.append(group["name"])
-    return unique_groups
+        unique_groups[base_name] = None
+        unique_groups[group["name"]] = None
+    return list(unique_groups)
 
 
 async def update_groups():
-    groups = _fetch_raw_groups()
+    groups = await _fetch_raw_groups()
     async with engine.begin() as conn:
-        for group in groups:
-            await conn.execute(
-                text(
-                    "INSERT INTO groups (name) "
-                    "SELECT CAST(:name AS VARCHAR) WHERE NOT EXISTS "
-                    "(SELECT 1 FROM groups WHERE name = CAST(:name AS VARCHAR))"
-                ),
-                {"name": group},
-            )
+        # Одна вставка всех групп вместо запроса на каждую группу
+        # Уже существующие группы пропускаются по ограничению uq_groups_name
+        await conn.execute(
+            text(
+                "INSERT INTO groups (name) "
+                "SELECT unnest(CAST(:names AS VARCHAR[])) "
+                "ON CONFLICT (name) DO NOTHING"
+            ),
+            {"names": groups},
+        )
 
 
 if __name__ == "__main__":
@@ -1,5 +1,9 @@
 """Пакет, содержащий вспомогательные функции."""
 
 from .semester_calculator import extract_semester_from_group_name
+from .ttl_cache import TTLCache
 
-__all__ = ("extract_semester_from_group_name",)
+__all__ = (
+    "extract_semester_from_group_name",
+    "TTLCache",
+)
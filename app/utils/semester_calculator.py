@@ -3,6 +3,12 @@
 import re
 from datetime import datetime
 
+# Первая последовательность цифр в названии группы - год поступления
+_ADMISSION_YEAR_PATTERN: re.Pattern[str] = re.compile(r"\D*(\d+)")
+
+# Месяцы нечетного (осеннего) семестра
+_FIRST_SEMESTER_MONTHS: frozenset[int] = frozenset({9, 10, 11, 12, 1, 2})
+
 
 def extract_semester_from_group_name(group_name: str) -> int:
     """
@@ -16,7 +22,7 @@ def extract_semester_from_group_name(group_name: str) -> int:
     :return: номер семестра
     """
 
-    match = re.search(r"\D*(\d+)", group_name)
+    match = _ADMISSION_YEAR_PATTERN.search(group_name)
     if not match:
         return 0
 
@@ -31,19 +37,15 @@ def extract_semester_from_group_name(group_name: str) -> int:
     current_year = now.year
     current_month = now.month  # Январь = 1, Сентябрь = 9
 
-    # 1 сентября года поступления
-    admission_date = datetime(admission_year, 9, 1)
-
-    if now > admission_date:
+    # Обучение начинается 1 сентября года поступления
+    if (current_year, current_month) >= (admission_year, 9):
         full_years = (
             current_year - admission_year - (1 if current_month < 9 else 0)
         )
     else:
         return -1
 
-    first_semester_months = {9, 10, 11, 12, 1, 2}
-
-    if current_month in first_semester_months:
+    if current_month in _FIRST_SEMESTER_MONTHS:
         return full_years * 2 + 1
     else:
         return full_years * 2 + 2
@@ -0,0 +1,71 @@
+"""Модуль, реализующий простой in-memory кэш с ограниченным временем жизни."""
+
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Класс, реализующий кэш с ограниченным временем жизни записей.
+
+    При превышении максимального размера вытесняется запись, к которой дольше
+    всего не обращались. Все операции синхронны, поэтому в рамках одного
+    event loop дополнительная синхронизация не требуется.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        """
+        Метод инициализации класса.
+
+        :param maxsize: максимальное количество записей в кэше
+        :param ttl: время жизни записи в секундах
+        """
+
+        self.maxsize: int = maxsize
+        self.ttl: float = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> Optional[V]:
+        """
+        Метод получения значения из кэша.
+
+        :param key: ключ записи
+        :return: значение, если запись существует и не устарела, иначе None
+        """
+
+        if (item := self._data.get(key)) is None:
+            return None
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        """
+        Метод записи значения в кэш.
+
+        :param key: ключ записи
+        :param value: значение записи
+        """
+
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """
+        Метод удаления записи из кэша.
+
+        :param key: ключ записи
+        """
+
+        self._data.pop(key, None)